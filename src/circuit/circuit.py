@@ -34,7 +34,8 @@ from __future__ import annotations
 from typing import Tuple, Union, Optional, Callable, Sequence, Iterable
 import doctest
 import itertools
-import parts
+import functools
+import operator
 import logical
 
 operation = logical.logical
@@ -49,7 +50,191 @@ Exported alias for the :obj:`~logical.logical.logical` class found in the
 `logical <https://pypi.org/project/logical>`__ library.
 """
 
-class gate: # pylint: disable=too-few-public-methods
+# Bitwise equivalents of all nullary, unary, and binary logical operations. Each
+# function takes a mask (with one bit set for every input being evaluated
+# simultaneously) followed by one packed integer for each argument of the
+# operation.
+_bitwise = {
+    op.nf_: lambda mask: 0,
+    op.nt_: lambda mask: mask,
+    op.uf_: lambda mask, x: 0,
+    op.id_: lambda mask, x: x,
+    op.not_: lambda mask, x: mask ^ x,
+    op.ut_: lambda mask, x: mask,
+    op.bf_: lambda mask, x, y: 0,
+    op.and_: lambda mask, x, y: x & y,
+    op.nimp_: lambda mask, x, y: x & (mask ^ y),
+    op.fst_: lambda mask, x, y: x,
+    op.nif_: lambda mask, x, y: (mask ^ x) & y,
+    op.snd_: lambda mask, x, y: y,
+    op.xor_: lambda mask, x, y: x ^ y,
+    op.or_: lambda mask, x, y: x | y,
+    op.nor_: lambda mask, x, y: mask ^ (x | y),
+    op.xnor_: lambda mask, x, y: mask ^ x ^ y,
+    op.nsnd_: lambda mask, x, y: mask ^ y,
+    op.if_: lambda mask, x, y: x | (mask ^ y),
+    op.nfst_: lambda mask, x, y: mask ^ x,
+    op.imp_: lambda mask, x, y: (mask ^ x) | y,
+    op.nand_: lambda mask, x, y: mask ^ (x & y),
+    op.bt_: lambda mask, x, y: mask
+}
+
+# Python expressions equivalent to all nullary, unary, and binary logical
+# operations. Within each expression, ``m`` is a mask (with one bit set for
+# every input being evaluated simultaneously) and the placeholders are filled
+# with the packed integer arguments of the operation.
+_symbolic = {
+    op.nf_: '0',
+    op.nt_: 'm',
+    op.uf_: '0',
+    op.id_: '{0}',
+    op.not_: 'm ^ {0}',
+    op.ut_: 'm',
+    op.bf_: '0',
+    op.and_: '{0} & {1}',
+    op.nimp_: '{0} & (m ^ {1})',
+    op.fst_: '{0}',
+    op.nif_: '(m ^ {0}) & {1}',
+    op.snd_: '{1}',
+    op.xor_: '{0} ^ {1}',
+    op.or_: '{0} | {1}',
+    op.nor_: 'm ^ ({0} | {1})',
+    op.xnor_: 'm ^ {0} ^ {1}',
+    op.nsnd_: 'm ^ {1}',
+    op.if_: '{0} | (m ^ {1})',
+    op.nfst_: 'm ^ {0}',
+    op.imp_: '(m ^ {0}) | {1}',
+    op.nand_: 'm ^ ({0} & {1})',
+    op.bt_: 'm'
+}
+
+# Translation tables between bytes that hold bit values and the ASCII digits that
+# represent those bits (used when packing bits into integers and unpacking them).
+_digits_from_bits = bytes.maketrans(b'\x00\x01', b'01')
+_bits_from_digits = bytes.maketrans(b'01', b'\x00\x01')
+
+# Set of nullary (constant) operations, retrieved once so that membership checks
+# while scheduling and pruning gates do not require attribute lookups.
+_nullary = frozenset(logical.nullary)
+
+def _bitwise_generic(
+        operation: logical.logical, # pylint: disable=redefined-outer-name
+        mask: int,
+        *arguments: int
+    ) -> int:
+    """
+    Apply an operation to packed integer arguments by combining (using bitwise
+    disjunction) all rows of the operation's truth table that have output ``1``.
+
+    >>> _bitwise_generic(op.imp_, 0b1111, 0b0011, 0b0101)
+    13
+    >>> _bitwise_generic(op.nand_, 0b11, 0b11, 0b11)
+    0
+
+    This function is used for operations having an arity greater than two.
+    It is consistent with the bitwise equivalents of all other operations.
+
+    >>> _bitwise_generic(op((1, 0, 0, 1, 0, 1, 0, 1)), 0b11, 0b01, 0b10, 0b11)
+    3
+    >>> all(
+    ...     _bitwise[o](0b1111, *([0b0011, 0b0101][:o.arity()])) ==
+    ...     _bitwise_generic(o, 0b1111, *([0b0011, 0b0101][:o.arity()]))
+    ...     for o in logical.every
+    ... )
+    True
+    """
+    result = 0
+    for (row, value) in zip(itertools.product((0, 1), repeat=len(arguments)), operation):
+        if value == 1:
+            term = mask
+            for (argument, bit) in zip(arguments, row):
+                term &= argument if bit == 1 else mask ^ argument
+            result |= term
+
+    return result
+
+def _bitwise_function(
+        operation: logical.logical # pylint: disable=redefined-outer-name
+    ) -> Callable[..., int]:
+    """
+    Return the bitwise equivalent of an operation (which takes a mask followed
+    by one packed integer for each argument of the operation).
+
+    >>> _bitwise_function(op.xor_)(0b1111, 0b0011, 0b0101)
+    6
+    >>> _bitwise_function(op((1, 0, 0, 1, 0, 1, 0, 1)))(0b11, 0b01, 0b10, 0b11)
+    3
+    """
+    if operation in _bitwise:
+        return _bitwise[operation]
+
+    return functools.partial(_bitwise_generic, operation)
+
+def _getter(indices: Sequence[int]) -> Callable[[Sequence[int]], Sequence[int]]:
+    """
+    Return a function that retrieves the entries at the supplied indices from a
+    list (always as a sequence, even when there are fewer than two indices).
+
+    >>> [_getter(indices)([5, 6, 7]) for indices in [(), (1,), (2, 0)]]
+    [[], [6], (7, 5)]
+    """
+    if len(indices) == 0:
+        return operator.itemgetter(slice(0, 0))
+
+    if len(indices) == 1:
+        return operator.itemgetter(slice(indices[0], indices[0] + 1))
+
+    return operator.itemgetter(*indices)
+
+@functools.lru_cache(maxsize=None)
+def _restrict(
+        operation: logical.logical, # pylint: disable=redefined-outer-name
+        values: Tuple[Optional[int], ...]
+    ) -> logical.logical:
+    """
+    Return the compiled operation obtained by fixing the arguments of an operation
+    that have known values (where every unknown value is represented by ``None``).
+    The result takes one argument for each unknown value, unless its value does
+    not depend on those arguments (in which case it is a nullary operation).
+
+    >>> [_restrict(op.and_, (None, 0)), _restrict(op.and_, (None, 1))]
+    [(0,), (0, 1)]
+    >>> _restrict(op((1, 0, 0, 1, 0, 1, 0, 1)), (None, 1, None)).name()
+    'snd'
+    """
+    table = []
+    for bits in itertools.product((0, 1), repeat=values.count(None)):
+        bits = iter(bits)
+        table.append(operation(*[
+            next(bits) if value is None else value
+            for value in values
+        ]))
+
+    return op(tuple(table[:1] if len(set(table)) == 1 else table)).compiled()
+
+@functools.lru_cache(maxsize=None)
+def _compiled(operation: logical.logical) -> logical.logical: # pylint: disable=redefined-outer-name
+    """
+    Return a compiled instance of an operation (retaining it so that each distinct
+    operation is compiled only once).
+
+    >>> _compiled(op.xor_).function(1, 0)
+    1
+    """
+    return op(operation).compiled()
+
+@functools.lru_cache(maxsize=None)
+def _name(operation: logical.logical) -> str: # pylint: disable=redefined-outer-name
+    """
+    Return the name of an operation (retaining it so that it is determined only
+    once for each distinct operation).
+
+    >>> _name(op.xor_)
+    'xor'
+    """
+    return operation.name()
+
+class gate: # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """
     Data structure for an individual circuit logic gate, with attributes that
     indicate the logical operation corresponding to the gate (represented using
@@ -67,6 +252,14 @@ class gate: # pylint: disable=too-few-public-methods
     >>> g0 = gate(op.id_, [])
     >>> g1 = gate(op.not_, [])
     >>> g2 = gate(op.and_, [g0, g1])
+    >>> g0.outputs == [g2]
+    True
+
+    The outputs of a gate can also be specified when it is created.
+
+    >>> g3 = gate(op.id_, [], [g2])
+    >>> g3.outputs == [g2]
+    True
 
     The list of inputs, if specified, must have either no entries or a number
     of entries that matches the operation arity. Otherwise, an exception is
@@ -77,6 +270,13 @@ class gate: # pylint: disable=too-few-public-methods
       ...
     ValueError: number of inputs must equal operation arity or zero
     """
+    # Gate instances are numerous, so their attributes are stored in slots
+    # (rather than in an instance dictionary) to reduce memory usage.
+    __slots__ = (
+        'operation', 'inputs', '_outputs', '_outputs_set', 'index',
+        'is_input', 'is_output', 'is_marked', '_input_indices'
+    )
+
     def __init__(
             self: gate,
             operation: logical.logical = None, # pylint: disable=redefined-outer-name
@@ -104,13 +304,28 @@ class gate: # pylint: disable=too-few-public-methods
                 )
 
         self.operation = op(operation).compiled()
-        self.inputs = [] if inputs is None else inputs
-        self.outputs = [] if outputs is None else outputs
         self.index = None
         self.is_input = is_input
         self.is_output = is_output
         self.is_marked = False
 
+        self.outputs = [] if outputs is None else list(outputs)
+
+        # Gates without inputs (such as input gates) need no further work.
+        if not inputs:
+            (self.inputs, self._input_indices) = ([] if inputs is None else inputs, ())
+            return
+
+        self.inputs = inputs
+
+        # Cache the indices of the input gates (at the time of construction) so
+        # that evaluation need not look them up. These must be refreshed if the
+        # input gates are ever assigned new indices.
+        self._input_indices = tuple(
+            None if ig is None else ig.index
+            for ig in self.inputs
+        )
+
         # Designate this new gate as an output gate for
         # each of its input gates.
         for ig in self.inputs:
@@ -131,9 +346,47 @@ class gate: # pylint: disable=too-few-public-methods
         >>> g2.output(g3) # Confirm this is idempotent.
         >>> c.count()
         4
+        >>> len(g2.outputs)
+        1
+
+        The list of output gates can also be assigned (or modified) directly.
+
+        >>> g2.outputs = []
+        >>> g2.output(g3)
+        >>> g2.outputs == [g3]
+        True
+        >>> g2.outputs.clear()
+        >>> g2.output(g3)
+        >>> g2.outputs == [g3]
+        True
+        """
+        outputs_set = self._outputs_set_synchronized()
+        if other not in outputs_set:
+            outputs_set.add(other)
+            self._outputs.append(other)
+
+    @property
+    def outputs(self: gate) -> Sequence[gate]:
+        """
+        List of the output gates of this gate.
         """
-        if not other in self.outputs:
-            self.outputs = self.outputs + [other]
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self: gate, outputs: Sequence[gate]):
+        self._outputs = outputs
+        self._outputs_set = set(outputs) # For constant-time membership checks.
+
+    def _outputs_set_synchronized(self: gate) -> set:
+        """
+        Return the set of output gates of this gate (rebuilding it first if the
+        list of output gates has been modified in-place such that the two no
+        longer have the same number of entries).
+        """
+        if len(self._outputs_set) != len(self._outputs):
+            self._outputs_set = set(self._outputs)
+
+        return self._outputs_set
 
 class gates(list):
     """
@@ -143,14 +396,102 @@ class gates(list):
     is found as the ``gates`` attribute of a :obj:`circuit` instance) or, at
     least, interconnected. However, an instance of this class could be used
     to represent any collection of gates.
+
+    Every modification of an instance (whether made using the methods of this
+    class or using any of the methods inherited from :obj:`list`) increments a
+    version counter, which enables a :obj:`circuit` instance to detect that its
+    evaluation schedule must be rebuilt. Modifications made directly to the
+    attributes of the individual :obj:`gate` objects in an instance are not
+    detected (see the :obj:`circuit.refresh` method).
     """
+    __slots__ = ('_version',)
+
+    def __init__(self: gates, iterable: Iterable[gate] = ()):
+        super().__init__(iterable)
+        self._version = 0
+
+    def __setitem__(self: gates, key, value):
+        super().__setitem__(key, value)
+        self._version += 1
+
+    def __delitem__(self: gates, key):
+        super().__delitem__(key)
+        self._version += 1
+
+    def __iadd__(self: gates, other: Iterable[gate]) -> gates:
+        super().__iadd__(other)
+        self._version += 1
+        return self
+
+    def __imul__(self: gates, other: int) -> gates:
+        super().__imul__(other)
+        self._version += 1
+        return self
+
+    def append(self: gates, g: gate): # pylint: disable=arguments-renamed
+        """
+        Append a gate to this instance (in the same manner as :obj:`list.append`).
+        """
+        super().append(g)
+        self._version += 1
+
+    def extend(self: gates, gs: Iterable[gate]): # pylint: disable=arguments-renamed
+        """
+        Append gates to this instance (in the same manner as :obj:`list.extend`).
+        """
+        super().extend(gs)
+        self._version += 1
+
+    def insert(self: gates, index: int, g: gate): # pylint: disable=arguments-renamed
+        """
+        Insert a gate into this instance (in the same manner as :obj:`list.insert`).
+        """
+        super().insert(index, g)
+        self._version += 1
+
+    def remove(self: gates, g: gate): # pylint: disable=arguments-renamed
+        """
+        Remove a gate from this instance (in the same manner as :obj:`list.remove`).
+        """
+        super().remove(g)
+        self._version += 1
+
+    def pop(self: gates, index: int = -1) -> gate:
+        """
+        Remove and return a gate (in the same manner as :obj:`list.pop`).
+        """
+        g = super().pop(index)
+        self._version += 1
+        return g
+
+    def clear(self: gates):
+        """
+        Remove all gates from this instance (in the same manner as :obj:`list.clear`).
+        """
+        super().clear()
+        self._version += 1
+
+    def reverse(self: gates):
+        """
+        Reverse this instance in-place (in the same manner as :obj:`list.reverse`).
+        """
+        super().reverse()
+        self._version += 1
+
+    def sort(self: gates, *args, **kwargs): # pylint: disable=arguments-differ
+        """
+        Sort this instance in-place (in the same manner as :obj:`list.sort`).
+        """
+        super().sort(*args, **kwargs)
+        self._version += 1
+
     @staticmethod
-    def mark(g: gate):
+    def mark(*gs: gate):
         """
-        Mark all gates reachable from the supplied gate via recursive traversal
+        Mark all gates reachable from the supplied gate (or gates) via traversal
         of input gate references.
 
-        :param g: Gate from which to mark all reachable gates (via input references).
+        :param gs: Gates from which to mark all reachable gates (via input references).
 
         >>> c = circuit()
         >>> g0 = c.gate(op.id_, is_input=True)
@@ -160,11 +501,37 @@ class gates(list):
         >>> gates.mark(g3)
         >>> all(g.is_marked for g in [g0, g1, g2, g3])
         True
+
+        The traversal is iterative, so there is no limit on the length of the
+        paths that can be traversed.
+
+        >>> gs = gates()
+        >>> gk = gs.gate(op.id_, [])
+        >>> for _ in range(2000):
+        ...     gk = gs.gate(op.not_, [gk])
+        >>> gates.mark(gk)
+        >>> all(g.is_marked for g in gs)
+        True
+
+        Any number of gates can be supplied, in which case all gates reachable
+        from any of them are marked in a single traversal.
+
+        >>> gs = gates()
+        >>> g0 = gs.gate(op.id_, [])
+        >>> g1 = gs.gate(op.id_, [])
+        >>> g2 = gs.gate(op.not_, [g0])
+        >>> g3 = gs.gate(op.not_, [g1])
+        >>> g4 = gs.gate(op.not_, [g1])
+        >>> gates.mark(g2, g3)
+        >>> [g.is_marked for g in gs]
+        [True, True, True, True, False]
         """
-        if not g.is_marked:
-            g.is_marked = True
-            for ig in g.inputs:
-                gates.mark(ig)
+        stack = list(gs)
+        while len(stack) > 0:
+            g = stack.pop()
+            if not g.is_marked:
+                g.is_marked = True
+                stack.extend(ig for ig in g.inputs if not ig.is_marked)
 
     def gate(
             self: gates,
@@ -220,6 +587,7 @@ class gates(list):
         >>> gates([g4, g5]).inputs() == [g3, g3]
         True
         """
+        members = set(self) # For constant-time membership checks.
         return [
             h
             for g in self
@@ -228,7 +596,7 @@ class gates(list):
                 if len(g.inputs) == g.operation.arity() else
                 [None for _ in range(g.operation.arity())]
             )
-            if h is None or h not in self
+            if h is None or h not in members
         ]
 
     def outputs(self: gates) -> Sequence[gate]:
@@ -255,7 +623,12 @@ class gates(list):
         >>> gates([g0, g1, g2, g5]).outputs() == [g3, g3]
         True
         """
-        return [h for g in self for h in g.outputs if h not in self]
+        members = set(self)
+        return [
+            h
+            for h in itertools.chain.from_iterable(g.outputs for g in self)
+            if h not in members
+        ]
 
     def sources(self: gates) -> Sequence[gate]:
         """
@@ -276,11 +649,12 @@ class gates(list):
         >>> gates([g0, g2, g4]).sources() == [g0, g4]
         True
         """
+        members = set(self)
         return [
             g
             for g in self
             if (
-                any(h not in self or h is None for h in g.inputs) or
+                any(h not in members or h is None for h in g.inputs) or
                 len(g.inputs) == 0
             )
         ]
@@ -303,7 +677,8 @@ class gates(list):
         >>> gates([g0, g2, g4]).sinks() == [g2, g4]
         True
         """
-        return [g for g in self if not any(g in h.inputs for h in self)]
+        consumed = set(itertools.chain.from_iterable(h.inputs for h in self))
+        return [g for g in self if g not in consumed]
 
     def discard(self: gates, g: gate):
         """
@@ -322,10 +697,14 @@ class gates(list):
         >>> gs.discard(g2)
         >>> gs.to_legible()
         (('id',), ('not', 0), ('not', None))
+        >>> g2 in g0.outputs or g2 in g1.outputs
+        False
         """
         for h in self:
             h.inputs = [None if ih is g else ih for ih in h.inputs]
-            if g in h.outputs:
+            outputs_set = h._outputs_set_synchronized() # pylint: disable=protected-access
+            if g in outputs_set:
+                outputs_set.remove(g)
                 h.outputs.remove(g)
 
         self.remove(g)
@@ -453,14 +832,17 @@ class gates(list):
         >>> gs.to_legible()
         (('id',), ('id',), ('not', 0), ('and', 1, 2), ('xor', 3, 3), ('id', 4), ('not', 4))
         """
-        # pylint: disable=too-many-branches
+        # pylint: disable=too-many-branches,too-many-locals
+
+        # Sets of the gates in each collection (for constant-time membership checks).
+        (members, old_members, new_members) = (set(self), set(old), set(new))
 
-        if not all(g in self for g in old):
+        if not all(g in members for g in old):
             raise ValueError(
                 'not all gates to be replaced appear in the gate collection'
             )
 
-        if not all(g not in self for g in new):
+        if not all(g not in members for g in new):
             raise ValueError(
                 'one or more replacement gates already appear in the gate collection'
             )
@@ -484,25 +866,27 @@ class gates(list):
         # Replacements are not permitted when they would cause to be removed an internal
         # (non-sink) gate within ``old`` that also acts as an input to a gate outside of
         # ``old``.
+        consumed_outside = set(itertools.chain.from_iterable(
+            h.inputs for h in self if h not in old_members
+        ))
         if any(
             True
             for g in old
-            if (
-                (g not in old_sinks) and
-                any(h for h in self if (h not in old) and (g in h.inputs))
-            )
+            if (g not in old_sinks) and (g in consumed_outside)
         ):
             raise ValueError(
                 'cannot replace a gate that is not a sink (in the gate collection to be ' +
                 'replaced) when it as an input to another gate outside of that collection'
             )
 
+        self._version += 1
+
         # Stitch new gates that have no inputs to the gates that fed into
         # the old inputs.
         old_inputs = iter(old.inputs())
         for h in new:
             h.inputs = [
-                next(old_inputs) if ih is None or ih not in new else ih
+                next(old_inputs) if ih is None or ih not in new_members else ih
                 for ih in (
                     h.inputs
                     if len(h.inputs) == h.operation.arity() else
@@ -528,16 +912,19 @@ class gates(list):
         # adding new gates (in the order that they appear in the instance ``new``)
         # as soon as their inputs are already in the list.
         (i, j) = (0, 0) # Indices into old and new gate lists, respectively.
+        placed = set() # Gates that appear before position ``i``.
         while i < len(self):
-            if self[i] in old:
+            if self[i] in old_members:
                 self.discard(self[i]) # No need to increment ``i`` because list shifts down.
             else:
+                placed.add(self[i])
                 i += 1 # The gate at index ``i`` is retained.
 
             # If all inputs into a new gate appear earlier than the current
             # position ``i``, insert the new gate at this position.
-            while j < len(new) and all(g in self[:i] for g in new[j].inputs):
+            while j < len(new) and all(g in placed for g in new[j].inputs):
                 self.insert(i, new[j])
+                placed.add(new[j])
                 i += 1 # Because a new gate was inserted.
                 j += 1 # Move on to the next new gate that could be inserted.
 
@@ -731,14 +1118,29 @@ class gates(list):
         >>> g1 = gs.gate(op.not_, [g0])
         >>> gs.to_immutable()
         (((0, 1), None), ((1, 0), 0))
+
+        Any attempt to convert a gate collection that has a gate with an input
+        gate that does not appear in the collection raises an exception.
+
+        >>> hs = gates([g1])
+        >>> hs.to_immutable() # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+          ...
+        ValueError: <...gate object at ...> is not in list
         """
-        return tuple(
-            (g.operation,) + tuple(
-                self.index(gi) if gi is not None else None
-                for gi in g.inputs
+        # Look up the position of each gate in constant time (rather than using
+        # a linear-time search for each input reference).
+        position = {g: i for (i, g) in enumerate(self)}
+        try:
+            return tuple(
+                (g.operation,) + tuple(
+                    position[gi] if gi is not None else None
+                    for gi in g.inputs
+                )
+                for g in self
             )
-            for g in self
-        )
+        except KeyError as error:
+            raise ValueError(repr(error.args[0]) + ' is not in list') from None
 
     def to_legible(self: gates) -> tuple:
         """
@@ -763,14 +1165,27 @@ class gates(list):
         >>> g1 = gs.gate(op.not_, [g0])
         >>> gs.to_legible()
         (('not', None), ('not', 0))
+
+        Any attempt to convert a gate collection that has a gate with an input
+        gate that does not appear in the collection raises an exception.
+
+        >>> hs = gates([g1])
+        >>> hs.to_legible() # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+          ...
+        ValueError: <...gate object at ...> is not in list
         """
-        return tuple(
-            (g.operation.name(),) + tuple(
-                self.index(gi) if gi is not None else None
-                for gi in g.inputs
+        position = {g: i for (i, g) in enumerate(self)} # As in :obj:`to_immutable`.
+        try:
+            return tuple(
+                (_name(g.operation),) + tuple(
+                    position[gi] if gi is not None else None
+                    for gi in g.inputs
+                )
+                for g in self
             )
-            for g in self
-        )
+        except KeyError as error:
+            raise ValueError(repr(error.args[0]) + ' is not in list') from None
 
 class signature:
     """
@@ -840,6 +1255,8 @@ class signature:
       ...
     TypeError: signature output format must be a tuple or list of integers
     """
+    __slots__ = ('input_format', 'output_format', '_output_slices')
+
     def __init__(
             self: signature,
             input_format: Sequence[int] = None,
@@ -863,6 +1280,17 @@ class signature:
             )
         self.output_format = list(output_format) if output_format is not None else None
 
+        # Precompute the boundaries of the output bit vectors within a flat list
+        # of output bits so that the output can be converted using slices.
+        self._output_slices = (
+            None
+            if output_format is None else
+            list(zip(
+                itertools.accumulate([0] + self.output_format[:-1]),
+                itertools.accumulate(self.output_format)
+            ))
+        )
+
     def input(
             self: signature,
             input: Sequence[Sequence[int]] # pylint: disable=redefined-builtin
@@ -876,31 +1304,45 @@ class signature:
         >>> s = signature(input_format=[2, 3])
         >>> s.input([[1, 0], [0, 1, 1]])
         [1, 0, 0, 1, 1]
+
+        Any attempt to convert an invalid input raises an exception.
+
+        >>> s.input([[1, 0], [0, 1, 'a']])
+        Traceback (most recent call last):
+          ...
+        TypeError: input must be a list or tuple of integer lists
+        >>> s.input([[1, 0], [0, 1, 2]])
+        Traceback (most recent call last):
+          ...
+        ValueError: each bit must be represented by 0 or 1
         """
+        # The checks below use :obj:`map` so that the type of each bit is
+        # checked without a Python-level loop iteration per bit.
         if self.input_format is None:
             if (
                 not isinstance(input, (tuple, list)) or
-                not all(isinstance(b, int) for b in input)
+                not all(map(isinstance, input, itertools.repeat(int)))
             ):
                 raise TypeError('input must be a list or tuple of integers')
-            if not all(b in (0, 1) for b in input):
+            if not set(input) <= {0, 1}:
                 raise ValueError('each bit must be represented by 0 or 1')
             return list(input)
 
         if (
             not isinstance(input, (tuple, list)) or
-            not all(
-                (isinstance(bs, (tuple, list)) and all(isinstance(b, int) for b in bs))
-                for bs in input
-            )
+            not all(map(isinstance, input, itertools.repeat((tuple, list))))
         ):
             raise TypeError('input must be a list or tuple of integer lists')
 
-        if not all(all(b in (0, 1) for b in bs) for bs in input):
+        bits = list(itertools.chain.from_iterable(input)) # Flatten the bit vector.
+        if not all(map(isinstance, bits, itertools.repeat(int))):
+            raise TypeError('input must be a list or tuple of integer lists')
+
+        if not set(bits) <= {0, 1}:
             raise ValueError('each bit must be represented by 0 or 1')
 
-        if [len(bs) for bs in input] == self.input_format:
-            return [b for bs in input for b in bs] # Flatten the bit vector.
+        if list(map(len, input)) == self.input_format:
+            return bits
 
         raise ValueError('input format does not match signature')
 
@@ -918,9 +1360,9 @@ class signature:
         if self.output_format is None:
             return list(output)
 
-        return list(parts.parts(output, length=self.output_format))
+        return [output[start:end] for (start, end) in self._output_slices]
 
-class circuit:
+class circuit: # pylint: disable=too-many-instance-attributes
     """
     Data structure for a circuit instance (with methods that enable counting
     of gates, pruning of inconsequential gates, and evaluation of the circuit
@@ -1095,17 +1537,66 @@ class circuit:
     >>> [g.operation.name() for g in c.gates]
     ['id', 'id', 'nt', 'nf', 'or', 'id']
     """
+    __slots__ = (
+        'gates', 'signature',
+        '_targets', '_operations', '_functions', '_functions_bitwise', '_arguments', '_getters',
+        '_output_indices', '_aliases', '_constants', '_scheduled',
+        '_compiled', '_cache', '_shared'
+    )
+
     def __init__(self: circuit, sig: Optional[signature] = None):
         self.gates = gates([])
         self.signature = signature() if sig is None else sig
 
-    def gate(
+        # Flat evaluation schedule represented using parallel lists that hold
+        # the index, the operation (with the values of any constant inputs folded
+        # into it), the compiled operation function, the bitwise equivalent of
+        # the operation, the non-constant input gate indices (and a function that
+        # retrieves the input values from a list of wire values) of every gate
+        # having a value that is computed during evaluation (in evaluation order),
+        # together with the indices of the output gates. These are maintained as
+        # gates are added and as the circuit is pruned. Identity gates that have
+        # an input (and gates that become identities once their constant inputs
+        # are folded) are not scheduled; instead, the index of each is mapped to
+        # the index of the gate from which it obtains its value. Gates having
+        # values that are determined by constant (nullary operation) gates are
+        # not scheduled either; instead, the index of each is mapped to its value.
+        self._targets = []
+        self._operations = []
+        self._functions = []
+        self._functions_bitwise = []
+        self._arguments = []
+        self._getters = []
+        self._output_indices = []
+        self._aliases = {}
+        self._constants = {}
+
+        # State of the gate collection (see the :obj:`_state` method) from which
+        # the evaluation schedule was constructed. If the gate collection is
+        # modified other than via the :obj:`gate` method of this circuit, the
+        # schedule is rebuilt when it is next needed.
+        self._scheduled = self._state()
+
+        # Compiled evaluation function (if one has been constructed using the
+        # :obj:`compile` method) and cache of evaluation results (if one has been
+        # created by the :obj:`evaluate_cached` method); these are discarded
+        # whenever the circuit changes.
+        self._compiled = None
+        self._cache = None
+
+        # Gates that were added with sharing enabled (indexed by their operation
+        # and their input gates) and that may be returned in place of equivalent
+        # gates (see the ``share`` parameter of the :obj:`gate` method).
+        self._shared = {}
+
+    def gate( # pylint: disable=too-many-arguments
             self: gates,
             operation: logical.logical = None, # pylint: disable=redefined-outer-name
             inputs: Sequence[gate] = None,
             outputs: Sequence[gate] = None,
             is_input: bool = False,
-            is_output: bool = False
+            is_output: bool = False,
+            share: bool = False
         ):
         """
         Add a gate with the specified attribute values to this collection of gates.
@@ -1115,6 +1606,11 @@ class circuit:
         :param outputs: List of output gate object references.
         :param is_input: Flag indicating if this is an input gate for a circuit.
         :param is_output: Flag indicating if this is an output gate for a circuit.
+        :param share: Flag indicating if an equivalent gate can be returned instead.
+
+        The evaluation schedule of the circuit is updated as each gate is added.
+        If the attributes of a gate in this circuit have been modified directly,
+        the :obj:`refresh` method must be invoked before another gate is added.
 
         Gate operations are represented using instances of the
         :obj:`~logical.logical.logical` class that is exported by the
@@ -1190,6 +1686,25 @@ class circuit:
         Traceback (most recent call last):
           ...
         ValueError: number of circuit gate inputs must match arity of gate operation
+
+        Two gates that have the same operation and the same input gates always
+        have the same value. If sharing is requested when adding a gate, a gate
+        that is equivalent to it is returned (if one was added earlier with
+        sharing requested and has not been pruned) instead of a new gate.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.or_, [g0, g1], share=True)
+        >>> g3 = c.gate(op.or_, [g0, g1], share=True)
+        >>> g4 = c.gate(op.or_, [g1, g0], share=True)
+        >>> g5 = c.gate(op.and_, [g3, g4])
+        >>> g6 = c.gate(op.id_, [g5], is_output=True)
+        >>> (g3 is g2, g4 is g2, c.count())
+        (True, False, 6)
+        >>> c.prune_and_topological_sort_stable()
+        >>> c.gate(op.or_, [g0, g1], share=True) is g2
+        True
         """
         if inputs is not None and None in inputs:
             raise ValueError(
@@ -1207,9 +1722,293 @@ class circuit:
                     'number of circuit gate inputs must match arity of gate operation'
                 )
 
-        return self.gates.gate(operation, inputs, outputs, is_input, is_output)
+        # Ensure the schedule is up to date so that the new gate can be added to it.
+        self._synchronize()
+
+        # Return an existing equivalent gate (if sharing is requested and
+        # permitted) or record the new gate so that it can be shared later.
+        share = share and outputs is None and not (is_input or is_output)
+        if share:
+            key = (operation, tuple(inputs or ()))
+            if key in self._shared:
+                return self._shared[key]
+
+        g = self.gates.gate(operation, inputs, outputs, is_input, is_output)
+        self._schedule(g)
+        self._scheduled = self._state()
+        (self._compiled, self._cache) = (None, None)
+        if share:
+            self._shared[key] = g
+
+        return g
+
+    def refresh(self: circuit):
+        """
+        Rebuild the evaluation schedule of this circuit (discarding any compiled
+        function and any retained evaluation results). The schedule is rebuilt
+        automatically whenever the gate collection of this circuit is replaced
+        or modified, but **not** when the attributes of an individual gate are
+        modified directly (*e.g.*, when the operation, the inputs, the outputs,
+        or the input/output flags of a gate are assigned or modified in-place).
+        This method must be invoked after any such modification and before the
+        circuit is evaluated or converted.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> c.to_logical()
+        (0, 0, 0, 1)
+        >>> g2.operation = op.or_
+        >>> c.refresh()
+        >>> c.to_logical()
+        (0, 1, 1, 1)
+        >>> c.compile()
+        >>> g2.inputs[1] = g0
+        >>> c.refresh()
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0], [0], [1], [1]]
+        """
+        self._reschedule()
+
+    def _state(self: circuit) -> tuple:
+        """
+        Return a record of the current state of the gate collection of this
+        circuit (consisting of the collection itself, its length, and its version).
+        A collection that is not a :obj:`gates` instance has no version, so it is
+        never treated as unchanged.
+        """
+        return (self.gates, len(self.gates), getattr(self.gates, '_version', None))
+
+    def _unchanged(self: circuit, state: tuple) -> bool:
+        """
+        Determine whether the gate collection of this circuit is still in the
+        recorded state supplied as an argument.
+        """
+        (gates_, count, version) = state
+        return (
+            version is not None and gates_ is self.gates and count == len(gates_) and
+            version == gates_._version # pylint: disable=protected-access
+        )
+
+    def _synchronize(self: circuit):
+        """
+        Rebuild the evaluation schedule if the gate collection of this circuit
+        has been replaced or modified since the schedule was last updated
+        (*e.g.*, if gates were added using the :obj:`gates.gate` method of the
+        collection rather than the :obj:`gate` method of the circuit).
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gates.gate(op.and_, [g0, g1])
+        >>> g3 = c.gates.gate(op.id_, [g2], is_output=True)
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0], [0], [0], [1]]
+        >>> c.to_logical()
+        (0, 0, 0, 1)
+        >>> g4 = c.gates.gate(op.not_, [g2])
+        >>> c.gates = gates([g0, g1, g2, g4])
+        >>> g5 = c.gate(op.id_, [g4], is_output=True)
+        >>> c.truth_table()
+        [7]
+
+        A gate collection that is a :obj:`list` (rather than a :obj:`gates`
+        instance) is also supported, though the schedule is then rebuilt whenever
+        it is needed.
 
-    def count(self: circuit, predicate: Callable[[gate], bool] = lambda _: True) -> int:
+        >>> c.gates = list(c.gates)
+        >>> c.evaluate([1, 1])
+        [0]
+
+        Modifications that do not change the number of gates in the collection
+        (such as replacements and reorderings) are also detected.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.or_, [g0, g1])
+        >>> g4 = c.gate(op.id_, [g2], is_output=True)
+        >>> g5 = c.gate(op.id_, [g3], is_output=True)
+        >>> c.evaluate([0, 1])
+        [0, 1]
+        >>> c.gates[4:] = [g5, g4]
+        >>> c.evaluate([0, 1])
+        [1, 0]
+        >>> c.gates.sort(key=lambda g: g is g5)
+        >>> c.evaluate([0, 1])
+        [0, 1]
+        >>> x = c.gates.pop()
+        >>> y = c.gates.pop()
+        >>> c.gates.append(x)
+        >>> c.gates.append(y)
+        >>> c.evaluate([0, 1])
+        [1, 0]
+        >>> c.gates.reverse()
+        >>> c.gates[:2] = [g5, g4]
+        >>> c.gates.reverse()
+        >>> c.evaluate([0, 1])
+        [0, 1]
+        >>> del c.gates[5]
+        >>> c.gates.insert(4, g5)
+        >>> c.evaluate([0, 1])
+        [1, 0]
+        >>> c.gates.clear()
+        >>> c.gates.extend([g0, g1, g2, g3])
+        >>> c.gates += [g4]
+        >>> c.gates *= 1
+        >>> c.gates.append(g5)
+        >>> c.evaluate([0, 1])
+        [0, 1]
+        >>> hs = gates()
+        >>> h0 = hs.gate(op.xor_, [None, None])
+        >>> c.gates.replace(gates([g2]), hs)
+        >>> c.evaluate([1, 1])
+        [0, 1]
+        """
+        if not self._unchanged(self._scheduled):
+            self._reschedule()
+
+    def _reschedule(self: circuit):
+        """
+        Assign to every gate its position within the gate collection of this
+        circuit as its index and then rebuild the evaluation schedule. Any
+        compiled function and any retained evaluation results are discarded.
+        """
+        (self._targets, self._operations, self._functions) = ([], [], [])
+        (self._functions_bitwise, self._arguments, self._getters) = ([], [], [])
+        (self._output_indices, self._aliases, self._constants) = ([], {}, {})
+
+        # The gates are in topological order, so the inputs of each gate have
+        # already been assigned their indices when that gate is reached.
+        for (index, g) in enumerate(self.gates):
+            g.index = index
+            g._input_indices = tuple( # pylint: disable=protected-access
+                ig.index for ig in g.inputs
+            )
+            self._schedule(g)
+
+        # Gates that are no longer in the collection cannot be shared.
+        members = set(self.gates)
+        self._shared = {key: g for (key, g) in self._shared.items() if g in members}
+
+        self._scheduled = self._state()
+        (self._compiled, self._cache) = (None, None)
+
+    def _count_inputs(self: circuit) -> int:
+        """
+        Return the number of input gates in this circuit (without scanning the
+        gates, as every other gate is either scheduled, an alias, or a constant).
+        The evaluation schedule is rebuilt first if it is out of date, as the
+        result would otherwise be incorrect.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> c._count_inputs() == c.count(lambda g: g.is_input) == 2
+        True
+        """
+        self._synchronize()
+        return (
+            len(self.gates) -
+            len(self._targets) - len(self._aliases) - len(self._constants)
+        )
+
+    def _schedule(self: circuit, g: gate):
+        """
+        Add a gate (that has just been added to this circuit or that has just
+        been placed in its final position during pruning) to the evaluation
+        schedule. Identity gates are not evaluated; the gates that use them as
+        inputs obtain their values directly from the gates they copy.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, [g0])
+        >>> g2 = c.gate(op.not_, [g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> [c.evaluate([0]), c.evaluate([1])]
+        [[1], [0]]
+
+        Gates having values that are determined by constant (nullary operation)
+        gates are not evaluated either; their values are determined when they
+        are added to the schedule. The values of constant inputs of any other
+        gate are folded into its operation, which may turn that gate into an
+        identity gate.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.nt_)
+        >>> g2 = c.gate(op.not_, [g1])
+        >>> g3 = c.gate(op.and_, [g0, g2])
+        >>> g4 = c.gate(op.or_, [g0, g2])
+        >>> g5 = c.gate(op.xor_, [g1, g0])
+        >>> g6 = c.gate(op.id_, [g3], is_output=True)
+        >>> g7 = c.gate(op.id_, [g4], is_output=True)
+        >>> g8 = c.gate(op.id_, [g5], is_output=True)
+        >>> [c.evaluate([0]), c.evaluate([1])]
+        [[0, 0, 1], [0, 1, 0]]
+        >>> c.evaluate_batch([[0], [1]])
+        [[0, 0, 1], [0, 1, 0]]
+        >>> c.compile()
+        >>> [c.evaluate([0]), c.evaluate([1])]
+        [[0, 0, 1], [0, 1, 0]]
+
+        Folding also applies to operations having an arity greater than two and
+        to gates having inputs that are themselves determined by constants.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.nt_)
+        >>> g3 = c.gate(op.nf_)
+        >>> g4 = c.gate(op.or_, [g3, c.gate(op.and_, [g2, g3])])
+        >>> g5 = c.gate(op((1, 0, 0, 1, 0, 1, 0, 1)), [g0, g2, g1])
+        >>> g6 = c.gate(op.or_, [g4, g5])
+        >>> g7 = c.gate(op.id_, [g6], is_output=True)
+        >>> c.to_logical()
+        (0, 1, 0, 1)
+        """
+        # The operation of a gate may have been assigned directly (without being
+        # compiled), in which case a compiled instance is used.
+        (operation, indices) = ( # pylint: disable=redefined-outer-name
+            g.operation if hasattr(g.operation, 'function') else _compiled(g.operation),
+            tuple(
+                self._aliases.get(i, i)
+                for i in g._input_indices # pylint: disable=protected-access
+            )
+        )
+
+        # Fold the values of any constant inputs into the operation, leaving an
+        # operation over only the remaining inputs (or a nullary operation if the
+        # value of the gate does not depend on the remaining inputs).
+        if any(i in self._constants for i in indices):
+            operation = _restrict(operation, tuple(map(self._constants.get, indices)))
+            indices = (
+                ()
+                if operation in _nullary else
+                tuple(i for i in indices if i not in self._constants)
+            )
+
+        if len(indices) == 1 and operation == op.id_:
+            self._aliases[g.index] = indices[0]
+        elif len(indices) > 0:
+            self._targets.append(g.index)
+            self._operations.append(operation)
+            self._functions.append(operation.function) # pylint: disable=no-member
+            self._functions_bitwise.append(_bitwise_function(operation))
+            self._arguments.append(indices)
+            self._getters.append(_getter(indices))
+        elif operation in _nullary:
+            self._constants[g.index] = operation.function() # pylint: disable=no-member
+
+        if len(g.outputs) == 0 and g.is_output:
+            self._output_indices.append(self._aliases.get(g.index, g.index))
+
+    def count(self: circuit, predicate: Optional[Callable[[gate], bool]] = None) -> int:
         """
         Count the number of gates that satisfy the supplied predicate.
         If no predicate is supplied, the total number of gates in the
@@ -1229,7 +2028,10 @@ class circuit:
         >>> c.count()
         6
         """
-        return len([() for g in self.gates if predicate(g)])
+        if predicate is None:
+            return len(self.gates)
+
+        return sum(1 for g in self.gates if predicate(g))
 
     def depth(self: circuit, predicate: Callable[[gate], bool] = lambda _: True) -> int:
         """
@@ -1302,14 +2104,17 @@ class circuit:
         >>> c.depth(lambda _g: _g.operation == op.and_)
         0
         """
-        depths = {}
+        # The index of every gate in a circuit matches its position in the list
+        # of gates, so the depths of the input gates can be retrieved directly.
+        self._synchronize()
+        depths = [0] * len(self.gates)
         for (i, g) in enumerate(self.gates):
             depths[i] = (
                 (1 if predicate(g) else 0) +
-                max((depths[self.gates.index(g_in)] for g_in in g.inputs), default=0)
+                max((depths[g_in.index] for g_in in g.inputs), default=0)
             )
 
-        return max(depths.values(), default=0)
+        return max(depths, default=0)
 
     def prune_and_topological_sort_stable(self: circuit):
         """
@@ -1332,52 +2137,208 @@ class circuit:
         4
         >>> [g.operation.name() for g in c.gates]
         ['id', 'id', 'not', 'id']
-        """
-        # Collect all gates that feed directly into the identity gates
-        # with no outputs; these are the effective output gates after
-        # pruning.
-        gate_output = []
-        for g in self.gates:
-            if len(g.outputs) == 0 and g.operation == op.id_ and g.is_output:
-                gate_output.append(g)
 
-        # Mark all gates that reach the output.
-        for g in self.gates:
-            g.is_marked = False
-        for g in gate_output:
-            gates.mark(g)
+        The ``gates`` attribute of the circuit remains an instance of
+        :obj:`gates` and the circuit can be evaluated as before.
 
-        index_old_to_new = {}
-        gates_ = [] # New gates to replace old gates.
+        >>> c.gates.to_legible()
+        (('id',), ('id',), ('not', 0), ('id', 2))
+        >>> [c.evaluate([bs]) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[[1]], [[1]], [[0]], [[0]]]
 
-        # Collect and prune the input gates at the beginning.
-        for (index, g) in enumerate(self.gates):
+        Pruning always reflects the current state of the circuit, including any
+        in-place modifications of its gate collection or of its individual gates
+        that were made after it was last pruned.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> g4 = c.gate(op.id_, [g0], is_output=True)
+        >>> c.prune_and_topological_sort_stable()
+        >>> c.count()
+        5
+        >>> g3.is_output = False
+        >>> c.prune_and_topological_sort_stable()
+        >>> c.gates.to_legible()
+        (('id',), ('id',), ('id', 0))
+        >>> c.evaluate([1, 0])
+        [1]
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> c.prune_and_topological_sort_stable()
+        >>> hs = gates()
+        >>> h0 = hs.gate(op.xor_, [None, None])
+        >>> h1 = hs.gate(op.not_, [h0])
+        >>> h2 = hs.gate(op.not_, [h1])
+        >>> c.gates.replace(gates([g2]), hs)
+        >>> c.prune_and_topological_sort_stable()
+        >>> [g.index for g in c.gates]
+        [0, 1, 2, 3, 4, 5]
+        >>> c.depth()
+        5
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0], [1], [1], [0]]
+        """
+        # In a single pass, clear any existing marks and collect the input gates
+        # (which are never pruned), the gates that feed directly into the identity
+        # gates with no outputs (these are the effective output gates after
+        # pruning), and the gates that may belong to the interior.
+        (gates_input, gates_candidate, gates_output) = ([], [], [])
+        for g in self.gates:
+            g.is_marked = False
             if len(g.inputs) == 0 and g.is_input:
-                index_old_to_new[index] = len(gates_)
-                gates_.append(g)
+                gates_input.append(g)
+            elif len(g.outputs) == 0:
+                if g.is_output and g.operation == op.id_:
+                    gates_output.append(g)
+            elif (
+                (len(g.inputs) > 0 or g.operation in _nullary) and
+                not (g.is_input or g.is_output)
+            ):
+                gates_candidate.append(g)
 
-        # Collect and prune the non-input/non-output gates in the interior.
-        for (index, g) in enumerate(self.gates):
-            if all([
-                (len(g.inputs) > 0 or g.operation in logical.nullary),
-                (len(g.outputs) > 0),
-                (not g.is_input and not g.is_output),
-                g.is_marked
-            ]):
-                index_old_to_new[index] = len(gates_)
-                gates_.append(g)
-
-        # Collect the new output gates at the end.
-        for g in gate_output:
+        # Mark all gates that reach the output (in a single traversal) and retain
+        # only the marked interior gates.
+        gates.mark(*gates_output)
+        gates_interior = [g for g in gates_candidate if g.is_marked]
+
+        # The output gates are placed at the end.
+        for g in gates_output:
             g.outputs = [] # This is now an output, so remove its outputs.
-            index_old_to_new[g.index] = len(gates_)
-            gates_.append(g)
 
-        # Update the index information to reflect the new order.
-        for g in gates_:
-            g.index = index_old_to_new[g.index]
+        self.gates = gates(gates_input + gates_interior + gates_output)
+
+        # Update the index information (and the cached input gate indices) to
+        # reflect the new order and rebuild the evaluation schedule.
+        self._reschedule()
+
+    def compile(self: circuit):
+        """
+        Compile this circuit into a Python function that consists of a single
+        assignment statement (involving only Python's built-in bitwise operators,
+        where possible) for each gate. Once a circuit has been compiled, the
+        :obj:`evaluate` and :obj:`evaluate_batch` methods use this function.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.nand_, [g0, g2])
+        >>> g4 = c.gate(op.id_, [g2], is_output=True)
+        >>> g5 = c.gate(op.id_, [g3], is_output=True)
+        >>> c.compile()
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0, 1], [0, 1], [0, 1], [1, 0]]
+        >>> c.evaluate_batch([[0, 0], [0, 1], [1, 0], [1, 1]])
+        [[0, 1], [0, 1], [0, 1], [1, 0]]
+
+        Boolean inputs produce the same integer outputs as they do when the
+        circuit is not compiled.
 
-        self.gates = gates_
+        >>> c.evaluate([True, True])
+        [1, 0]
+
+        The compiled function is discarded if the circuit is modified (*e.g.*,
+        if a gate is added or if the circuit is pruned).
+
+        >>> g6 = c.gate(op.not_, [g1])
+        >>> g7 = c.gate(op.id_, [g6], is_output=True)
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0, 1, 1], [0, 1, 0], [0, 1, 1], [1, 0, 0]]
+
+        Circuits can contain gates corresponding to any logical operation,
+        including operations having an arity greater than two.
+
+        >>> c = circuit(signature([3], [1]))
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.id_, is_input=True)
+        >>> g3 = c.gate(op.nt_)
+        >>> g4 = c.gate(op((1, 0, 0, 1, 0, 1, 0, 1)), [g0, g1, g2])
+        >>> g5 = c.gate(op.if_, [g4, g3])
+        >>> g6 = c.gate(op.id_, [g5], is_output=True)
+        >>> c.to_logical()
+        (1, 0, 0, 1, 0, 1, 0, 1)
+        >>> c.compile()
+        >>> c.to_logical()
+        (1, 0, 0, 1, 0, 1, 0, 1)
+
+        The compiled function for every unary and binary operation is consistent
+        with that operation.
+
+        >>> def check(o):
+        ...     c = circuit()
+        ...     gs = [c.gate(op.id_, is_input=True) for _ in range(o.arity())]
+        ...     g = c.gate(op.id_, [c.gate(o, gs)], is_output=True)
+        ...     c.compile()
+        ...     return c.to_logical() == o
+        >>> all(check(o) for o in logical.unary | logical.binary)
+        True
+
+        Gates having values that are determined by constant (nullary operation)
+        gates are folded into constants, so no assignment statement is emitted
+        for them.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.nf_)
+        >>> g3 = c.gate(op.and_, [g0, g2])
+        >>> g4 = c.gate(op.or_, [g1, g3])
+        >>> g5 = c.gate(op.not_, [g3])
+        >>> g6 = c.gate(op.id_, [g4], is_output=True)
+        >>> g7 = c.gate(op.id_, [g5], is_output=True)
+        >>> interpreted = [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        >>> c.compile()
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0, 1], [1, 1], [0, 1], [1, 1]]
+        >>> c.evaluate_batch([[0, 0], [0, 1], [1, 0], [1, 1]]) == interpreted
+        True
+
+        Compiling a circuit that has not changed since it was last compiled has
+        no effect (the existing compiled function is retained), so the results
+        continue to agree with those obtained without compilation.
+
+        >>> c.compile()
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]] == interpreted
+        True
+        """
+        self._synchronize()
+        if self._compiled is not None:
+            return
+
+        # Constant inputs have already been folded into the scheduled operations,
+        # so constant values can only be referenced by the returned output list.
+        def wire(i):
+            return ('0', 'm')[self._constants[i]] if i in self._constants else 'w' + str(i)
+
+        (scope, lines) = ({}, [])
+        for (index, o, function_bitwise, indices) in zip(
+            self._targets, self._operations, self._functions_bitwise, self._arguments
+        ):
+            arguments = ['w' + str(i) for i in indices]
+            if o in _symbolic:
+                expression = _symbolic[o].format(*arguments)
+            else:
+                scope['f' + str(index)] = function_bitwise
+                expression = 'f' + str(index) + '(' + ', '.join(['m'] + arguments) + ')'
+            lines.append('    w' + str(index) + ' = ' + expression)
+
+        # The parameters of the function are the mask and the input gate wires.
+        parameters = ['w' + str(i) for i in range(self._count_inputs())]
+        source = '\n'.join(
+            ['def function(' + ', '.join(['m'] + parameters) + '):'] +
+            lines +
+            ['    return [' + ', '.join(wire(i) for i in self._output_indices) + ']']
+        )
+        exec(compile(source, '<circuit>', 'exec'), scope) # pylint: disable=exec-used
+        self._compiled = scope['function']
 
     def evaluate(
             self: circuit,
@@ -1390,6 +2351,9 @@ class circuit:
 
         :param input: Input bit vector or bit vectors.
 
+        If the attributes of a gate in this circuit have been modified directly,
+        the :obj:`refresh` method must be invoked before the circuit is evaluated.
+
         >>> c = circuit()
         >>> g0 = c.gate(op.id_, is_input=True)
         >>> g1 = c.gate(op.id_, is_input=True)
@@ -1425,27 +2389,260 @@ class circuit:
         Traceback (most recent call last):
           ...
         ValueError: input format does not match signature
+
+        Any attempt to evaluate a circuit on an input that does not have exactly
+        one bit for each input gate raises an exception.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> c.evaluate([1])
+        Traceback (most recent call last):
+          ...
+        ValueError: number of input bits must match number of input gates
+        >>> c.compile()
+        >>> c.evaluate([1, 1, 1])
+        Traceback (most recent call last):
+          ...
+        ValueError: number of input bits must match number of input gates
         """
-        wire = (
-            self.signature.input(input) +
-            (
-                [None] *
-                self.count(
-                    # Create empty wire entries for any gates with inputs and any constant
-                    # (nullary operation) gates.
-                    lambda g: len(g.inputs) > 0 or g.operation in logical.nullary
-                )
+        bits = self.signature.input(input)
+        if len(bits) != self._count_inputs():
+            raise ValueError('number of input bits must match number of input gates')
+
+        return self.signature.output(self._evaluate(bits))
+
+    def evaluate_unchecked(self: circuit, bits: Sequence[int]) -> Sequence[int]:
+        """
+        Evaluate the circuit on a flat list of input bits (with one bit for each
+        input gate) and return a flat list of output bits (with one bit for each
+        output gate). Unlike the :obj:`evaluate` method, this method does not
+        validate the input and ignores the circuit signature, so it is suitable
+        for use only when the input is known to be valid.
+
+        :param bits: Flat input bit vector.
+
+        >>> c = circuit(signature([2], [1]))
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> [c.evaluate_unchecked(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0], [0], [0], [1]]
+        """
+        return self._evaluate(bits)
+
+    def _evaluate(self: circuit, bits: Sequence[int]) -> Sequence[int]:
+        """
+        Evaluate the circuit on a flat list of input bits and return a flat
+        list of output bits.
+        """
+        self._synchronize()
+        if self._compiled is not None:
+            return self._compiled(1, *map(int, bits))
+
+        # Each wire value is a single bit, so the values are stored compactly
+        # in a byte array (with zeroed entries for all non-input gates, other
+        # than those having constant values).
+        wire = bytearray(bits) + bytearray(len(self.gates) - self._count_inputs())
+        for (index, value) in self._constants.items():
+            wire[index] = value
+
+        # Evaluate the gates (retrieving the values of their inputs using the
+        # precomputed getters to avoid building a list for each gate).
+        for (index, function, getter) in zip(self._targets, self._functions, self._getters):
+            wire[index] = function(*getter(wire))
+
+        return list(map(wire.__getitem__, self._output_indices))
+
+    def evaluate_cached(
+            self: circuit,
+            input: Union[Sequence[int], Sequence[Sequence[int]]] # pylint: disable=redefined-builtin
+        ) -> Union[Sequence[int], Sequence[Sequence[int]]]:
+        """
+        Evaluate the circuit on an input in the same manner as the :obj:`evaluate`
+        method, but retain the results of the most recent evaluations (up to 4096
+        of them) so that the result for a previously encountered input can be
+        retrieved without evaluating the circuit again.
+
+        :param input: Input bit vector or bit vectors.
+
+        >>> c = circuit(signature([2], [1]))
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.id_, [g2], is_output=True)
+        >>> [c.evaluate_cached([bs]) for bs in [[0, 1], [1, 1], [0, 1], [1, 1]]]
+        [[[0]], [[1]], [[0]], [[1]]]
+
+        The retained results are discarded if the circuit is modified (*e.g.*,
+        if a gate is added or if the circuit is pruned).
+
+        >>> g4 = c.gate(op.xor_, [g0, g1])
+        >>> g5 = c.gate(op.id_, [g4], is_output=True)
+        >>> c.signature = signature([2], [2])
+        >>> [c.evaluate_cached([bs]) for bs in [[0, 1], [1, 1], [0, 1], [1, 1]]]
+        [[[0, 1]], [[1, 0]], [[0, 1]], [[1, 0]]]
+
+        As with the :obj:`evaluate` method, the input must have exactly one bit
+        for each input gate.
+
+        >>> c.signature = signature()
+        >>> c.evaluate_cached([1, 1, 1])
+        Traceback (most recent call last):
+          ...
+        ValueError: number of input bits must match number of input gates
+        """
+        bits = tuple(self.signature.input(input))
+        if len(bits) != self._count_inputs():
+            raise ValueError('number of input bits must match number of input gates')
+
+        if self._cache is None:
+            self._cache = functools.lru_cache(maxsize=4096)(
+                lambda bits: tuple(self._evaluate(bits))
             )
+
+        return self.signature.output(list(self._cache(bits)))
+
+    def evaluate_batch(
+            self: circuit,
+            inputs: Iterable[Union[Sequence[int], Sequence[Sequence[int]]]]
+        ) -> Sequence[Union[Sequence[int], Sequence[Sequence[int]]]]:
+        """
+        Evaluate the circuit on every input in a sequence of inputs (each of
+        which must be organized in a way that matches the circuit signature's
+        input format) and return a list of outputs (each of which matches the
+        circuit signature's output format).
+
+        :param inputs: Sequence of input bit vectors or of lists of bit vectors.
+
+        The result is the same as that obtained by invoking the :obj:`evaluate`
+        method on each input.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.imp_, [g0, g2])
+        >>> g4 = c.gate(op.id_, [g2], is_output=True)
+        >>> g5 = c.gate(op.id_, [g3], is_output=True)
+        >>> c.evaluate_batch([[0, 0], [0, 1], [1, 0], [1, 1]])
+        [[0, 1], [0, 1], [0, 0], [1, 1]]
+        >>> [c.evaluate(bs) for bs in [[0, 0], [0, 1], [1, 0], [1, 1]]]
+        [[0, 1], [0, 1], [0, 0], [1, 1]]
+
+        Rather than evaluating each gate once for every input, this method packs
+        the bits found at each position within all of the inputs into a single
+        integer and then evaluates each gate only once (on integers representing
+        the packed bits) using bitwise operations. This is usually significantly
+        faster than invoking the :obj:`evaluate` method on each input.
+
+        >>> c = circuit(signature([2], [1]))
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.nt_)
+        >>> g3 = c.gate(op.xor_, [g0, g1])
+        >>> g4 = c.gate(op.and_, [g2, g3])
+        >>> g5 = c.gate(op.not_, [g4])
+        >>> g6 = c.gate(op.id_, [g5], is_output=True)
+        >>> c.evaluate_batch([[[0, 0]], [[0, 1]], [[1, 0]], [[1, 1]]])
+        [[[1]], [[0]], [[0]], [[1]]]
+        >>> c.evaluate_batch([])
+        []
+
+        Any attempt to evaluate a circuit on inputs that do not all have the
+        same number of bits raises an exception.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, [g0], is_output=True)
+        >>> c.evaluate_batch([[0], [0, 1]])
+        Traceback (most recent call last):
+          ...
+        ValueError: all inputs must have the same number of bits
+        >>> c.evaluate_batch([[0, 1], [0, 1]])
+        Traceback (most recent call last):
+          ...
+        ValueError: number of input bits must match number of input gates
+        """
+        inputs = [self.signature.input(bss) for bss in inputs]
+        if len(inputs) == 0:
+            return []
+
+        if len({len(bits) for bits in inputs}) != 1:
+            raise ValueError('all inputs must have the same number of bits')
+
+        if len(inputs[0]) != self._count_inputs():
+            raise ValueError('number of input bits must match number of input gates')
+
+        # Bit ``j`` of each packed integer corresponds to the input at index ``j``.
+        # The bits are packed by converting them into a string of binary digits.
+        words = self.evaluate_packed(
+            [
+                int(bytes(reversed(column)).translate(_digits_from_bits), 2)
+                for column in zip(*inputs)
+            ],
+            len(inputs)
         )
 
+        # Unpack the bits of each output gate (such that the bit corresponding
+        # to the input at index ``j`` is found at index ``j`` of the byte string).
+        outputs = [
+            format(word, 'b').zfill(len(inputs))[::-1].encode().translate(_bits_from_digits)
+            for word in words
+        ]
+
+        # Transpose the byte strings so that each entry holds the output bits for
+        # one input.
+        columns = zip(*outputs) if len(outputs) > 0 else [()] * len(inputs)
+        return [self.signature.output(list(bits)) for bits in columns]
+
+    def evaluate_packed(self: circuit, words: Sequence[int], count: int) -> Sequence[int]:
+        """
+        Evaluate the circuit simultaneously on ``count`` inputs that have been
+        packed into integers (one integer for each input gate, with bit ``j`` of
+        each integer corresponding to the input at index ``j``) and return the
+        outputs packed in the same way (one integer for each output gate).
+
+        :param words: Packed integer for each input gate.
+        :param count: Number of inputs that have been packed.
+
+        This method makes it possible to avoid the cost of packing and unpacking
+        the bits of the inputs and outputs when evaluating a circuit on a large
+        number of inputs (*e.g.*, by supplying the packed integers directly).
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.and_, [g0, g1])
+        >>> g3 = c.gate(op.nor_, [g0, g1])
+        >>> g4 = c.gate(op.id_, [g2], is_output=True)
+        >>> g5 = c.gate(op.id_, [g3], is_output=True)
+        >>> [bin(word) for word in c.evaluate_packed([0b1100, 0b1010], 4)]
+        ['0b1000', '0b1']
+        >>> c.compile()
+        >>> [bin(word) for word in c.evaluate_packed([0b1100, 0b1010], 4)]
+        ['0b1000', '0b1']
+        """
+        self._synchronize()
+        mask = (1 << count) - 1
+
+        if self._compiled is not None:
+            return self._compiled(mask, *words)
+
+        wire = list(words) + ([None] * (len(self.gates) - self._count_inputs()))
+        for (index, value) in self._constants.items():
+            wire[index] = mask * value
+
         # Evaluate the gates.
-        for g in self.gates:
-            if len(g.inputs) > 0 or g.operation in logical.nullary:
-                wire[g.index] = g.operation.function(*[wire[ig.index] for ig in g.inputs])
+        for (index, function, getter) in zip(
+            self._targets, self._functions_bitwise, self._getters
+        ):
+            wire[index] = function(mask, *getter(wire))
 
-        return self.signature.output(
-            [wire[g.index] for g in self.gates if len(g.outputs) == 0 and g.is_output]
-        )
+        return list(map(wire.__getitem__, self._output_indices))
 
     def to_logical(self: circuit) -> logical.logical:
         """
@@ -1454,6 +2651,9 @@ class circuit:
         class). The running time and memory usage of this method are
         **exponential in the number of input gates**.
 
+        If the attributes of a gate in this circuit have been modified directly,
+        the :obj:`refresh` method must be invoked before the circuit is converted.
+
         >>> c = circuit()
         >>> g0 = c.gate(op.id_, is_input=True)
         >>> g1 = c.gate(op.id_, is_input=True)
@@ -1490,22 +2690,51 @@ class circuit:
           ...
         ValueError: circuit must have exactly one output gate
         """
-        if self.count(lambda g: g.is_output) != 1:
+        self._synchronize()
+        if len(self._output_indices) != 1:
             raise ValueError('circuit must have exactly one output gate')
 
-        # Build the truth table in an appropriate manner, depending on whether
-        # this instance has a signature specified.
-        ts = itertools.product(*([[0, 1]] * self.count(lambda g: g.is_input)))
+        # Unpack the bits of the truth table in a single conversion (such that
+        # the bit corresponding to the input at index ``j`` is found at index ``j``).
+        word = self.truth_table()[0]
         return logical.logical(
-            [self.evaluate(list(t))[0] for t in ts]
-            if self.signature.input_format is None else
-            [
-                self.evaluate(
-                    list(parts.parts(t, length=self.signature.input_format))
-                )[0][0]
-                for t in ts
-            ]
+            format(word, 'b').zfill(1 << self._count_inputs())[::-1]
+            .encode().translate(_bits_from_digits)
         )
 
+    def truth_table(self: circuit) -> Sequence[int]:
+        """
+        Evaluate the circuit on every possible input and return one integer for
+        each output gate, where bit ``j`` of each integer is the value of that
+        output when the circuit is evaluated on the ``j``-th input (with inputs
+        ordered as in :obj:`itertools.product`, so the first input gate is the
+        most significant). The running time and memory usage of this method are
+        **exponential in the number of input gates**.
+
+        >>> c = circuit()
+        >>> g0 = c.gate(op.id_, is_input=True)
+        >>> g1 = c.gate(op.id_, is_input=True)
+        >>> g2 = c.gate(op.id_, is_input=True)
+        >>> g3 = c.gate(op.and_, [g0, g1])
+        >>> g4 = c.gate(op.xor_, [g2, g3])
+        >>> g5 = c.gate(op.id_, [g3], is_output=True)
+        >>> g6 = c.gate(op.id_, [g4], is_output=True)
+        >>> [bin(word) for word in c.truth_table()]
+        ['0b11000000', '0b1101010']
+
+        All of the inputs are evaluated simultaneously using the :obj:`evaluate_packed`
+        method. The packed integer for each input gate consists of alternating blocks
+        of zeros and ones, so it can be constructed without enumerating the inputs.
+        """
+        count = self._count_inputs()
+        length = 1 << count
+        words = []
+        for i in range(count):
+            block = 1 << (count - 1 - i) # Number of consecutive identical bits.
+            pattern = ((1 << block) - 1) << block # One block of zeros, then of ones.
+            words.append(pattern * (((1 << length) - 1) // ((1 << (2 * block)) - 1)))
+
+        return self.evaluate_packed(words, length)
+
 if __name__ == '__main__':
     doctest.testmod() # pragma: no cover